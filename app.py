@@ -1,89 +1,48 @@
 import streamlit as st
 import random
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import io
 import os
+import time
 from uuus.ai_text_generator import get_ai_suggestions, generate_ai_text
+from uuus.background_generator import BACKGROUND_STYLES
+from uuus.color_engine import contrast_level, readable_mask, suggest_color_schemes
+from uuus.design_renderer import DESIGN_SIZE, render_design
+from uuus.font_manager import FONT_STYLES, FONT_CATEGORIES, detect_available_fonts, load_font
+from uuus.glyph_atlas import TEXT_BACKENDS
+from uuus.photo_background import PHOTO_TYPES, describe_stats, load_photo_background
+from uuus.vector_export import design_to_pdf, design_to_svg
+from uuus.variant_grid import MAX_VARIANTS, build_variants, render_contact_sheet, variant_label
 
-# Available fonts dictionary
-FONT_STYLES = {
-    "Arial": "arial",
-    "Arial Bold": "arialbd",
-    "Times New Roman": "times",
-    "Georgia": "georgia",
-    "Verdana": "verdana",
-    "Courier New": "cour",
-    "Trebuchet MS": "trebuc",
-    "Comic Sans MS": "comic",
-    "Impact": "impact",
-    "Tahoma": "tahoma",
-    "Lucida Console": "lucon",
-    "Palatino": "pala",
-    "Garamond": "gara",
-    "Bookman": "bookman"
-}
+# Color schemes offered by the suggestion buttons and the variant grid
+COLOR_SCHEMES = [
+    ("#2C3E50", "#FFFFFF"),  # Dark blue / White
+    ("#000000", "#FFD700"),   # Black / Gold
+    ("#FFFFFF", "#FF0000"),   # White / Red
+    ("#000080", "#FFFFFF"),   # Navy / White
+    ("#008000", "#FFFFFF"),   # Green / White
+    ("#800080", "#FFFFFF"),   # Purple / White
+]
 
-# Font categories for better organization
-FONT_CATEGORIES = {
-    "Sans-serif": ["Arial", "Arial Bold", "Verdana", "Tahoma", "Trebuchet MS"],
-    "Serif": ["Times New Roman", "Georgia", "Palatino", "Garamond", "Bookman"],
-    "Monospace": ["Courier New", "Lucida Console"],
-    "Casual": ["Comic Sans MS", "Impact"]
-}
+# High contrast combinations
+HIGH_CONTRAST_SCHEMES = [
+    ("#000000", "#FFFFFF"),  # Black/White
+    ("#FFFFFF", "#000000"),  # White/Black
+    ("#0000FF", "#FFFF00"),  # Blue/Yellow
+]
 
-def detect_available_fonts():
-    """Detect which fonts are available on the system"""
-    available = {}
-    
-    # Always include all fonts from our dictionary
-    for font_name in FONT_STYLES.keys():
-        available[font_name] = FONT_STYLES[font_name]
-    
-    return available
+def apply_color_scheme(scheme, message):
+    """Set the color pickers to a scheme (runs before the widgets are drawn)"""
+    st.session_state.bg_color = scheme[0]
+    st.session_state.text_color = scheme[1]
+    st.session_state.color_message = message
 
-def load_font(font_name, font_size):
-    """Load font with fallback handling - UPDATED FOR BETTER FONT LOADING"""
-    try:
-        # Try to load the font using multiple methods
-        font_file_base = FONT_STYLES.get(font_name, "arial")
-        
-        # Common variations to try
-        font_variations = [
-            font_file_base + ".ttf",  # Most common
-            font_file_base,  # Just the name
-            font_file_base.upper() + ".ttf",  # Uppercase
-            font_file_base.capitalize() + ".ttf",  # Capitalized
-        ]
-        
-        # For specific fonts, add more variations
-        if "Arial" in font_name:
-            font_variations.extend(["arial.ttf", "Arial.ttf", "ARIAL.TTF"])
-        elif "Times" in font_name:
-            font_variations.extend(["times.ttf", "Times.ttf", "timesbd.ttf"])
-        elif "Comic" in font_name:
-            font_variations.extend(["comic.ttf", "Comic.ttf", "comicbd.ttf"])
-        
-        # Try each variation
-        for font_variation in font_variations:
-            try:
-                return ImageFont.truetype(font_variation, font_size)
-            except:
-                continue
-        
-        # If all else fails, try to create a default font with the requested size
-        try:
-            # Try to use a default truetype font
-            return ImageFont.truetype("arial.ttf", font_size)
-        except:
-            # Last resort: create a bitmap font with approximate size
-            # Note: load_default() doesn't accept size parameter, so we'll scale it
-            default_font = ImageFont.load_default()
-            # We'll use the default and hope for the best
-            return default_font
-            
-    except Exception as e:
-        # Ultimate fallback
-        return ImageFont.load_default()
+def promote_variant(variant):
+    """Make a variant from the grid the main design"""
+    st.session_state.selected_font = variant["font_name"]
+    st.session_state.font_size = variant["font_size"]
+    st.session_state.bg_color = variant["bg_color"]
+    st.session_state.text_color = variant["text_color"]
 
 # Page configuration
 st.set_page_config(
@@ -181,6 +140,14 @@ if 'selected_font' not in st.session_state:
     st.session_state.selected_font = "Arial Bold"
 if 'available_fonts' not in st.session_state:
     st.session_state.available_fonts = detect_available_fonts()
+if 'font_size' not in st.session_state:
+    st.session_state.font_size = 72  # Much larger default
+if 'bg_color' not in st.session_state:
+    st.session_state.bg_color = "#FFFFFF"
+if 'text_color' not in st.session_state:
+    st.session_state.text_color = "#000000"
+if 'variants' not in st.session_state:
+    st.session_state.variants = []
 
 # Header
 st.markdown("<h1 class='main-header'>🎨 SMART DESIGNER APP</h1>", unsafe_allow_html=True)
@@ -325,8 +292,8 @@ with col1:
                 "FONT SIZE:", 
                 min_value=40, 
                 max_value=150, 
-                value=72,  # Much larger default
                 step=5,
+                key="font_size",
                 help="RECOMMENDED: 60-100 for large text, 40-60 for normal"
             )
             
@@ -407,45 +374,85 @@ with col1:
         st.markdown("### 🎨 COLOR SETTINGS")
         col_c1, col_c2 = st.columns(2)
         with col_c1:
-            bg_color = st.color_picker("BACKGROUND COLOR:", "#FFFFFF")
+            bg_color = st.color_picker("BACKGROUND COLOR:", key="bg_color")
             # Show current color
             st.markdown(f"<div style='background-color:{bg_color}; padding:10px; border-radius:5px;'>Background: {bg_color}</div>", unsafe_allow_html=True)
         
         with col_c2:
-            text_color = st.color_picker("TEXT COLOR:", "#000000")
+            text_color = st.color_picker("TEXT COLOR:", key="text_color")
             # Show current color
             st.markdown(f"<div style='color:{text_color}; padding:10px; border-radius:5px; border:2px solid {text_color};'>Text Color: {text_color}</div>", unsafe_allow_html=True)
         
+        # Background style (gradients, patterns and textures)
+        st.markdown("### 🌈 BACKGROUND STYLE")
+        bg_style = st.selectbox("BACKGROUND TYPE:", BACKGROUND_STYLES)
+        bg_color2 = "#000000"
+        bg_angle = 90
+        bg_intensity = 12
+        if bg_style in ["Linear Gradient", "Radial Gradient", "Duotone", "Stripes"]:
+            col_bg1, col_bg2 = st.columns(2)
+            with col_bg1:
+                bg_color2 = st.color_picker("SECOND COLOR:", "#8E2DE2")
+            with col_bg2:
+                if bg_style != "Radial Gradient":
+                    bg_angle = st.slider("ANGLE:", 0, 360, 90, 15,
+                                       help="Direction of the gradient or pattern in degrees")
+        elif bg_style == "Noise Texture":
+            bg_intensity = st.slider("TEXTURE STRENGTH:", 2, 40, 12,
+                                   help="How much grain is added to the background color")
+        
+        # Photo background - decoded once at canvas size and cached per upload
+        photo_upload = st.file_uploader("📷 PHOTO BACKGROUND (optional):", type=PHOTO_TYPES,
+                                        help="Your photo is cropped to fill the design and replaces the background style")
+        bg_photo = None
+        if photo_upload is not None:
+            try:
+                bg_photo, photo_stats = load_photo_background(photo_upload, DESIGN_SIZE)
+                st.caption(describe_stats(photo_stats))
+            except Exception as e:
+                st.error(f"❌ **Could not read photo:** {str(e)}")
+        
         # Color scheme suggestions
         col_scheme1, col_scheme2 = st.columns(2)
         with col_scheme1:
-            if st.button("🎨 SUGGEST COLORS", use_container_width=True):
-                color_schemes = [
-                    ("#2C3E50", "#FFFFFF"),  # Dark blue / White
-                    ("#000000", "#FFD700"),   # Black / Gold
-                    ("#FFFFFF", "#FF0000"),   # White / Red
-                    ("#000080", "#FFFFFF"),   # Navy / White
-                    ("#008000", "#FFFFFF"),   # Green / White
-                    ("#800080", "#FFFFFF"),   # Purple / White
-                ]
-                scheme = random.choice(color_schemes)
-                bg_color = scheme[0]
-                text_color = scheme[1]
-                st.success(f"Applied: {scheme[0]} / {scheme[1]}")
+            readable = [s for s, ok in zip(COLOR_SCHEMES, readable_mask(COLOR_SCHEMES)) if ok]
+            scheme = random.choice(readable or COLOR_SCHEMES)
+            st.button("🎨 SUGGEST COLORS", use_container_width=True,
+                      on_click=apply_color_scheme,
+                      args=(scheme, f"Applied: {scheme[0]} / {scheme[1]}"))
         
         with col_scheme2:
-            if st.button("🔄 HIGH CONTRAST", use_container_width=True):
-                # High contrast combinations
-                contrasts = [
-                    ("#000000", "#FFFFFF"),  # Black/White
-                    ("#FFFFFF", "#000000"),  # White/Black
-                    ("#0000FF", "#FFFF00"),  # Blue/Yellow
-                    ("#FF0000", "#00FF00"),  # Red/Green
-                ]
-                scheme = random.choice(contrasts)
-                bg_color = scheme[0]
-                text_color = scheme[1]
-                st.success("High contrast scheme applied!")
+            high_contrast = [s for s, ok in zip(HIGH_CONTRAST_SCHEMES, readable_mask(HIGH_CONTRAST_SCHEMES)) if ok]
+            contrast = random.choice(high_contrast or HIGH_CONTRAST_SCHEMES)
+            st.button("🔄 HIGH CONTRAST", use_container_width=True,
+                      on_click=apply_color_scheme,
+                      args=(contrast, "High contrast scheme applied!"))
+        
+        if st.session_state.get('color_message'):
+            st.success(st.session_state.pop('color_message'))
+        
+        # Readability check (WCAG contrast ratio)
+        ratio, level = contrast_level(bg_color, text_color)
+        if level == "Fail":
+            st.warning(f"⚠️ **Contrast:** {ratio:.2f}:1 - below WCAG AA (4.5:1), text may be hard to read")
+        else:
+            st.success(f"✅ **Contrast:** {ratio:.2f}:1 - passes WCAG {level}")
+        
+        # Closest readable alternatives to the current colors
+        st.markdown("### 💡 READABLE SUGGESTIONS")
+        suggested = suggest_color_schemes(bg_color, text_color, top_n=4,
+                                          extra_schemes=COLOR_SCHEMES + HIGH_CONTRAST_SCHEMES)
+        suggestion_cols = st.columns(len(suggested) or 1)
+        for i, (sug_bg, sug_text, sug_ratio) in enumerate(suggested):
+            with suggestion_cols[i]:
+                st.markdown(
+                    f"<div style='background-color:{sug_bg}; color:{sug_text}; padding:10px; "
+                    f"border-radius:5px; text-align:center; font-weight:bold;'>Aa {sug_ratio:.1f}:1</div>",
+                    unsafe_allow_html=True
+                )
+                st.button("APPLY", key=f"contrast_sug_{i}", use_container_width=True,
+                          on_click=apply_color_scheme,
+                          args=((sug_bg, sug_text), f"Applied: {sug_bg} / {sug_text}"))
     
     with tab3:
         st.markdown("### ⚙️ LAYOUT SETTINGS")
@@ -459,6 +466,10 @@ with col1:
             line_spacing = st.slider("LINE SPACING:", 1.0, 3.0, 1.5, 0.1,
                                    help="Space between lines of text")
         
+        # Vector files cost extra time (texture and photo backgrounds are embedded), so they are opt-in
+        vector_formats = st.multiselect("VECTOR EXPORTS:", ["SVG", "PDF"], default=[],
+                                        help="Also build SVG/PDF downloads when generating the design")
+        
         # Alignment preview
         align_symbol = "←" if alignment == "Left" else "↑" if alignment == "Center" else "→"
         st.markdown(f"**Current Alignment:** {alignment} {align_symbol}")
@@ -470,6 +481,61 @@ with col1:
                                 type="primary", 
                                 use_container_width=True,
                                 help="Click to create your design with current settings")
+    
+    # Variant grid - compare many font/color/size combinations at once
+    with st.expander("🧩 VARIANT GRID", expanded=False):
+        variant_schemes = st.selectbox(
+            "COLOR SCHEMES:",
+            ["Suggested", "High Contrast", "Both"]
+        )
+        variant_category = st.selectbox("FONT CATEGORY:", list(FONT_CATEGORIES.keys()))
+        # Sizes on the FONT SIZE slider's grid (40-150, step 5) so a variant can be promoted
+        variant_sizes = st.multiselect("FONT SIZES:", [50, 60, 70, 80, 100, 120], default=[60, 80, 100])
+        variant_backend = st.selectbox("TEXT RENDERER:", TEXT_BACKENDS, index=TEXT_BACKENDS.index("Glyph Atlas"),
+                                       help="Glyph Atlas reuses rendered letters across variants")
+        
+        if variant_schemes == "Suggested":
+            schemes = COLOR_SCHEMES
+        elif variant_schemes == "High Contrast":
+            schemes = HIGH_CONTRAST_SCHEMES
+        else:
+            schemes = COLOR_SCHEMES + HIGH_CONTRAST_SCHEMES
+        
+        if st.checkbox("SKIP LOW-CONTRAST SCHEMES (WCAG AA)", value=True):
+            schemes = [s for s, ok in zip(schemes, readable_mask(schemes)) if ok]
+        
+        variant_count = len(schemes) * len(FONT_CATEGORIES[variant_category]) * len(variant_sizes)
+        st.markdown(f"**Variants:** {min(variant_count, MAX_VARIANTS)}")
+        if variant_count > MAX_VARIANTS:
+            st.warning(f"⚠️ Only the first {MAX_VARIANTS} variants will be rendered.")
+        
+        if st.button("🧩 GENERATE VARIANTS", use_container_width=True):
+            if design_text and variant_sizes and schemes:
+                variants = build_variants(schemes, FONT_CATEGORIES[variant_category], variant_sizes)
+                start = time.perf_counter()
+                with st.spinner(f"Rendering {len(variants)} variants..."):
+                    sheet = render_contact_sheet(
+                        design_text,
+                        variants,
+                        {
+                            "alignment": alignment,
+                            "padding": padding,
+                            "line_spacing": line_spacing,
+                            "bg_style": bg_style,
+                            "bg_color2": bg_color2,
+                            "bg_angle": bg_angle,
+                            "bg_intensity": bg_intensity,
+                            "text_backend": variant_backend,
+                            "background": bg_photo,
+                        }
+                    )
+                sheet_bytes = io.BytesIO()
+                sheet.save(sheet_bytes, format='PNG')
+                st.session_state.variants = variants
+                st.session_state.variant_sheet = sheet_bytes.getvalue()
+                st.session_state.variant_time = time.perf_counter() - start
+            else:
+                st.warning("Please enter text, pick at least one font size and keep at least one color scheme")
 
 with col2:
     st.markdown("<h3 class='sub-header'>🎨 DESIGN PREVIEW</h3>", unsafe_allow_html=True)
@@ -479,61 +545,25 @@ with col2:
     with preview_container:
         if generate_btn and design_text:
             # Create image with larger dimensions for big text
-            width = 800  # Increased from 600
-            height = 500  # Increased from 400
+            width, height = DESIGN_SIZE  # Increased from 600 x 400
             
             try:
-                # Create image
-                img = Image.new('RGB', (width, height), color=bg_color)
-                draw = ImageDraw.Draw(img)
-                
-                # Load selected font
-                font = load_font(st.session_state.selected_font, font_size)
-                
-                # Handle multiline text for large fonts
-                lines = design_text.split('\n')
-                total_height = 0
-                line_heights = []
+                # Settings shared by the PNG, SVG and PDF outputs
+                design_settings = dict(
+                    alignment=alignment,
+                    padding=padding,
+                    line_spacing=line_spacing,
+                    bg_style=bg_style,
+                    bg_color2=bg_color2,
+                    bg_angle=bg_angle,
+                    bg_intensity=bg_intensity,
+                    size=(width, height),
+                    background=bg_photo
+                )
+                design_args = (design_text, st.session_state.selected_font, font_size, text_color, bg_color)
                 
-                # Calculate total height for all lines
-                for line in lines:
-                    if line.strip():  # Only calculate for non-empty lines
-                        text_bbox = draw.textbbox((0, 0), line, font=font)
-                        line_height = text_bbox[3] - text_bbox[1]
-                        line_heights.append(line_height)
-                        total_height += line_height * line_spacing
-                    else:
-                        line_heights.append(0)
-                
-                # If no lines with text, use single line
-                if total_height == 0:
-                    text_bbox = draw.textbbox((0, 0), design_text, font=font)
-                    total_height = (text_bbox[3] - text_bbox[1]) * line_spacing
-                    lines = [design_text]
-                    line_heights = [text_bbox[3] - text_bbox[1]]
-                
-                # Calculate starting Y position
-                start_y = (height - total_height) / 2
-                current_y = start_y
-                
-                # Draw each line
-                for i, line in enumerate(lines):
-                    if line.strip():  # Only draw non-empty lines
-                        text_bbox = draw.textbbox((0, 0), line, font=font)
-                        text_width = text_bbox[2] - text_bbox[0]
-                        line_height = line_heights[i]
-                        
-                        # Set x position based on alignment
-                        if alignment == "Left":
-                            x = padding
-                        elif alignment == "Center":
-                            x = (width - text_width) / 2
-                        else:  # Right
-                            x = width - text_width - padding
-                        
-                        # Draw text
-                        draw.text((x, current_y), line, font=font, fill=text_color)
-                        current_y += line_height * line_spacing
+                # Create image on the selected background
+                img = render_design(*design_args, **design_settings)
                 
                 # Convert to bytes
                 img_bytes = io.BytesIO()
@@ -554,6 +584,7 @@ with col2:
                     with col_info2:
                         st.markdown(f"### 🎯 **Alignment:** {alignment}")
                         st.markdown(f"### 🎨 **Colors:** BG: {bg_color}")
+                        st.markdown(f"### 🌈 **Background:** {'Photo' if bg_photo is not None else bg_style}")
                 
                 # Download buttons - LARGE
                 col_d1, col_d2 = st.columns(2)
@@ -572,6 +603,33 @@ with col2:
                         st.session_state.selected_text = ""
                         st.rerun()
                 
+                # Vector exports skip rasterisation and scale to any print size.
+                # They are built only when requested, and a failure leaves the PNG usable.
+                if vector_formats:
+                    col_d3, col_d4 = st.columns(2)
+                    try:
+                        if "SVG" in vector_formats:
+                            with col_d3:
+                                st.download_button(
+                                    label="📐 **DOWNLOAD SVG**",
+                                    data=design_to_svg(*design_args, **design_settings),
+                                    file_name=f"design_{st.session_state.design_count+1}.svg",
+                                    mime="image/svg+xml",
+                                    use_container_width=True
+                                )
+                        
+                        if "PDF" in vector_formats:
+                            with col_d4:
+                                st.download_button(
+                                    label="📄 **DOWNLOAD PDF**",
+                                    data=design_to_pdf(*design_args, **design_settings),
+                                    file_name=f"design_{st.session_state.design_count+1}.pdf",
+                                    mime="application/pdf",
+                                    use_container_width=True
+                                )
+                    except Exception as e:
+                        st.warning(f"⚠️ **Vector export unavailable:** {str(e)} - the PNG above is unaffected.")
+                
                 # Increment counter
                 st.session_state.design_count += 1
                 
@@ -629,6 +687,17 @@ with col2:
             **🎯 TIP:** For banners and posters, use font sizes above **70px**!
             """)
 
+    # Variant contact sheet
+    if st.session_state.variants:
+        st.markdown("<h3 class='sub-header'>🧩 VARIANTS</h3>", unsafe_allow_html=True)
+        st.image(st.session_state.variant_sheet, use_column_width=True,
+                 caption=f"{len(st.session_state.variants)} VARIANTS RENDERED IN {st.session_state.variant_time:.2f}s")
+        
+        labels = [variant_label(i, v) for i, v in enumerate(st.session_state.variants)]
+        promoted = st.selectbox("PICK A VARIANT:", range(len(labels)), format_func=lambda i: labels[i])
+        st.button("⭐ USE THIS VARIANT", use_container_width=True,
+                  on_click=promote_variant, args=(st.session_state.variants[promoted],))
+
 # Footer
 st.markdown("---")
 col_f1, col_f2, col_f3 = st.columns([1, 3, 1])
@@ -0,0 +1,129 @@
+import xml.etree.ElementTree as ET
+
+import pymupdf
+import pytest
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from uuus import font_manager
+from uuus.design_renderer import DESIGN_SIZE, layout_text, text_mask
+from uuus.vector_export import design_to_pdf, design_to_svg, glyph_positions
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+TEXTS = ["AVATAR Tower\nWave, yo!", "Café ā Ωμέγα €"]
+
+def _clear_font_caches():
+    font_manager._thread_fonts.__dict__.clear()
+    layout_text.cache_clear()
+    text_mask.cache_clear()
+
+@pytest.fixture
+def kerned_font(monkeypatch):
+    """
+    Serve "Verdana" from DejaVu Sans, which has a kern table and Latin-1/Latin Extended coverage
+    """
+    try:
+        path = ImageFont.truetype("DejaVuSans.ttf", 12).path
+    except OSError:
+        pytest.skip("DejaVu Sans is not installed")
+    resolve = font_manager.resolve_font_path
+    monkeypatch.setattr(font_manager, "resolve_font_path",
+                        lambda name: path if name == "Verdana" else resolve(name))
+    _clear_font_caches()
+    yield "Verdana"
+    monkeypatch.undo()
+    _clear_font_caches()
+
+def _svg_positions(svg):
+    root = ET.fromstring(svg)
+    group = root.find(f"{SVG_NS}g")
+    positions = []
+    for element in group.findall(f"{SVG_NS}text"):
+        xs = [float(x) for x in element.get("x").split()]
+        positions.extend((char, x, float(element.get("y"))) for char, x in zip(element.text, xs))
+    return float(group.get("font-size")), positions
+
+def _pdf_positions(pdf):
+    page = pymupdf.open(stream=pdf, filetype="pdf")[0]
+    positions, sizes = [], set()
+    for block in page.get_text("rawdict")["blocks"]:
+        for line in block.get("lines", []):
+            for span in line["spans"]:
+                sizes.add(round(span["size"], 3))
+                positions.extend((char["c"], char["origin"][0], char["origin"][1]) for char in span["chars"])
+    return sizes, positions
+
+def _assert_matches_raster(positions, text, font_name, font_size, alignment="Center"):
+    """
+    Draw every exported glyph on its own at its exported pen position and
+    require the result to equal the PNG renderer's text mask pixel for pixel
+    """
+    assert "".join(char for char, _, _ in positions) == text.replace("\n", "")
+
+    font = font_manager.load_font(font_name, font_size)
+    ascent = font.getmetrics()[0]
+    glyphs = Image.new('L', DESIGN_SIZE, 0)
+    for char, x, baseline in positions:
+        single = Image.new('L', DESIGN_SIZE, 0)
+        ImageDraw.Draw(single).text((x, baseline - ascent), char, font=font, fill=255)
+        glyphs = ImageChops.lighter(glyphs, single)
+
+    raster = Image.new('L', DESIGN_SIZE, 0)
+    mask, offset = text_mask(text, font_name, font_size, alignment, 50, 1.5, DESIGN_SIZE)
+    raster.paste(mask, offset)
+
+    assert glyphs.getbbox() is not None
+    assert ImageChops.difference(glyphs, raster).getbbox() is None
+
+@pytest.mark.parametrize("alignment", ["Left", "Center", "Right"])
+@pytest.mark.parametrize("text", TEXTS)
+def test_svg_glyphs_match_raster(kerned_font, text, alignment):
+    size, positions = _svg_positions(design_to_svg(text, kerned_font, 48, "#FFFFFF", "#000000", alignment))
+    assert size == font_manager.load_font(kerned_font, 48).size
+    _assert_matches_raster(positions, text, kerned_font, 48, alignment)
+
+@pytest.mark.parametrize("alignment", ["Left", "Center", "Right"])
+@pytest.mark.parametrize("text", TEXTS)
+def test_pdf_glyphs_match_raster(kerned_font, text, alignment):
+    sizes, positions = _pdf_positions(design_to_pdf(text, kerned_font, 48, "#FFFFFF", "#000000", alignment))
+    assert sizes == {48}
+    _assert_matches_raster(positions, text, kerned_font, 48, alignment)
+
+def test_kerned_pairs_match_raster(kerned_font):
+    # DejaVu kerns A-V by under 0.1 px at 72 px; ten glyphs add up to a
+    # visible shift in the raster if kerning were left out
+    text = "AVAVAVAVAV"
+    font = font_manager.load_font(kerned_font, 72)
+    (_, xs, _), = glyph_positions(text, kerned_font, 72)
+    assert xs[1] - xs[0] < font.getlength("A") - 0.01
+    _assert_matches_raster(_svg_positions(design_to_svg(text, kerned_font, 72, "#FFFFFF", "#000000"))[1],
+                           text, kerned_font, 72)
+    _assert_matches_raster(_pdf_positions(design_to_pdf(text, kerned_font, 72, "#FFFFFF", "#000000"))[1],
+                           text, kerned_font, 72)
+
+def test_missing_font_uses_default_font_size():
+    # No MS fonts here means load_font falls back to Pillow's default font,
+    # and the export has to follow its size rather than the requested one
+    _clear_font_caches()
+    font = font_manager.load_font("Arial Bold", 72)
+    if font.size == 72:
+        pytest.skip("Arial Bold is installed")
+    text = "DESIGN YOUR VISION"
+    svg_size, svg_positions = _svg_positions(design_to_svg(text, "Arial Bold", 72, "#000000", "#FFFFFF"))
+    assert svg_size == font.size
+    _assert_matches_raster(svg_positions, text, "Arial Bold", 72)
+    pdf_sizes, pdf_positions = _pdf_positions(design_to_pdf(text, "Arial Bold", 72, "#000000", "#FFFFFF"))
+    assert pdf_sizes == {font.size}
+    _assert_matches_raster(pdf_positions, text, "Arial Bold", 72)
+
+@pytest.mark.parametrize("export", [design_to_svg, design_to_pdf])
+def test_raqm_layout_is_refused(kerned_font, export):
+    # Under raqm the PNG gets ligatures and GPOS kerning the export can't reproduce
+    font_manager.load_font(kerned_font, 48).layout_engine = ImageFont.Layout.RAQM
+    with pytest.raises(ValueError, match="raqm"):
+        export("fit office", kerned_font, 48, "#FFFFFF", "#000000")
+
+@pytest.mark.parametrize("export", [design_to_svg, design_to_pdf])
+def test_text_needing_shaping_is_refused(kerned_font, export):
+    with pytest.raises(ValueError, match="shaping"):
+        export("مرحبا", kerned_font, 48, "#FFFFFF", "#000000")
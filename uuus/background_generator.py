@@ -0,0 +1,185 @@
+import time
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from PIL import Image, ImageColor
+
+# Background styles offered in the COLORS tab
+BACKGROUND_STYLES = [
+    "Solid",
+    "Linear Gradient",
+    "Radial Gradient",
+    "Duotone",
+    "Stripes",
+    "Noise Texture",
+]
+
+# Generated arrays are kept per parameter set; a 4K background is ~33 MB
+BACKGROUND_CACHE_SIZE = 8
+
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    """
+    Convert a hex/named color into an (r, g, b) tuple
+    """
+    return ImageColor.getrgb(color)[:3]
+
+def _pack_colors(colors: np.ndarray) -> np.ndarray:
+    """
+    Pack an (n, 3) array of RGB values into n opaque RGBA words
+    """
+    rgba = np.empty((len(colors), 4), dtype=np.uint8)
+    rgba[:, :3] = colors
+    rgba[:, 3] = 255
+    # Viewing the bytes keeps the RGBA memory order on any endianness
+    return rgba.view(np.uint32).ravel()
+
+def _color_ramp(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> np.ndarray:
+    """
+    Build a 256-entry packed RGBA lookup table blending color1 into color2
+    """
+    t = np.linspace(0.0, 1.0, 256, dtype=np.float32)[:, None]
+    start = np.asarray(color1, dtype=np.float32)
+    end = np.asarray(color2, dtype=np.float32)
+    return _pack_colors(np.rint(start + (end - start) * t))
+
+def _unit_axes(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Open (broadcastable) coordinate grids spanning 0..1 on each axis
+    """
+    xs = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :]
+    ys = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    return xs, ys
+
+def _linear_field(width: int, height: int, angle: float) -> np.ndarray:
+    """
+    Gradient position (0..1) along the direction given by angle in degrees
+    """
+    xs, ys = _unit_axes(width, height)
+    theta = np.deg2rad(angle)
+    # Scale by the aspect ratio so the angle is measured in pixel space
+    dx = np.float32(np.cos(theta) * width)
+    dy = np.float32(np.sin(theta) * height)
+    field = xs * dx + ys * dy
+    lo = min(0.0, dx) + min(0.0, dy)
+    hi = max(0.0, dx) + max(0.0, dy)
+    return (field - lo) / max(hi - lo, 1e-6)
+
+def _radial_field(width: int, height: int) -> np.ndarray:
+    """
+    Distance from the canvas center, 0 at the center and 1 at the corners
+    """
+    xs, ys = _unit_axes(width, height)
+    dx = (xs - 0.5) * width
+    dy = (ys - 0.5) * height
+    return np.sqrt(dx * dx + dy * dy) / np.float32(np.hypot(width, height) / 2)
+
+def _to_index(field: np.ndarray) -> np.ndarray:
+    """
+    Quantise a 0..1 field into uint8 lookup indices
+    """
+    index = np.multiply(field, 255.0, dtype=np.float32)
+    np.clip(index, 0, 255, out=index)
+    return index.astype(np.uint8)
+
+@lru_cache(maxsize=BACKGROUND_CACHE_SIZE)
+def _background_array(style: str, width: int, height: int,
+                      color1: Tuple[int, int, int], color2: Tuple[int, int, int],
+                      angle: float, intensity: int, seed: int) -> np.ndarray:
+    """
+    Render a background as a read-only (height, width) array of packed RGBA words.
+
+    Every style reduces to a uint8 index per pixel looked up in a small
+    color table, so the per-pixel work is a single gather.
+    """
+    if style == "Solid":
+        pixels = np.full((height, width), _pack_colors(np.asarray([color1]))[0], dtype=np.uint32)
+    elif style == "Linear Gradient":
+        pixels = _color_ramp(color1, color2)[_to_index(_linear_field(width, height, angle))]
+    elif style == "Radial Gradient":
+        pixels = _color_ramp(color1, color2)[_to_index(_radial_field(width, height))]
+    elif style == "Duotone":
+        # Hard split along the gradient direction
+        tones = _pack_colors(np.asarray([color1, color2]))
+        pixels = tones[(_linear_field(width, height, angle) >= 0.5).view(np.uint8)]
+    elif style == "Stripes":
+        # Diagonal bands roughly 1/12 of the shorter side wide
+        xs = np.arange(width, dtype=np.float32)[None, :]
+        ys = np.arange(height, dtype=np.float32)[:, None]
+        theta = np.deg2rad(angle)
+        band = np.float32(max(min(width, height) / 12.0, 1.0))
+        position = (xs * np.float32(np.cos(theta) / band)) + (ys * np.float32(np.sin(theta) / band))
+        tones = _pack_colors(np.asarray([color1, color2]))
+        pixels = tones[np.floor(position).astype(np.int32) & 1]
+    elif style == "Noise Texture":
+        # Subtle monochrome grain on top of color1; seeded so it caches
+        intensity = max(0, min(int(intensity), 127))
+        offsets = np.arange(-intensity, intensity + 1, dtype=np.int16)[:, None]
+        shades = _pack_colors(np.clip(np.asarray(color1, dtype=np.int16) + offsets, 0, 255))
+        rng = np.random.default_rng(seed)
+        pixels = shades[rng.integers(0, len(shades), size=(height, width), dtype=np.uint8)]
+    else:
+        raise ValueError(f"Unknown background style: {style}")
+
+    pixels = np.ascontiguousarray(pixels)
+    pixels.flags.writeable = False
+    return pixels
+
+def background_view(style: str, size: Tuple[int, int], color1: str, color2: str = "#000000",
+                    angle: float = 90.0, intensity: int = 12, seed: int = 0) -> Image.Image:
+    """
+    Read-only RGBA view of a cached background, wrapped without copying.
+
+    Pasting it into an RGB image copies the color channels directly, which
+    is cheaper than building a private canvas when nothing is drawn on it.
+    """
+    width, height = size
+    pixels = _background_array(
+        style, int(width), int(height),
+        _parse_color(color1), _parse_color(color2),
+        float(angle), int(intensity), int(seed)
+    )
+    return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+def generate_background(style: str, size: Tuple[int, int], color1: str, color2: str = "#000000",
+                        angle: float = 90.0, intensity: int = 12, seed: int = 0) -> Image.Image:
+    """
+    Create an RGB background image for the design canvas.
+
+    The pixels are produced as a cached NumPy array and wrapped into PIL
+    without copying; the returned image is a private RGB canvas that is
+    safe to draw on.
+    """
+    return background_view(style, size, color1, color2, angle, intensity, seed).convert("RGB")
+
+def clear_background_cache():
+    """
+    Drop all cached background arrays
+    """
+    _background_array.cache_clear()
+
+def benchmark_backgrounds(size: Tuple[int, int] = (3840, 2160), repeats: int = 3) -> dict:
+    """
+    Time each background style at the given size.
+
+    Returns {style: (cold_ms, warm_ms)} where cold is a fresh render and
+    warm is a cache hit including the PIL conversion.
+    """
+    results = {}
+    for style in BACKGROUND_STYLES:
+        cold = []
+        for _ in range(repeats):
+            clear_background_cache()
+            start = time.perf_counter()
+            generate_background(style, size, "#2C3E50", "#E74C3C", angle=45)
+            cold.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        generate_background(style, size, "#2C3E50", "#E74C3C", angle=45)
+        warm = (time.perf_counter() - start) * 1000
+        results[style] = (min(cold), warm)
+    clear_background_cache()
+    return results
+
+if __name__ == "__main__":
+    for style, (cold_ms, warm_ms) in benchmark_backgrounds().items():
+        print(f"{style:16s} cold {cold_ms:7.1f} ms   cached {warm_ms:6.1f} ms")
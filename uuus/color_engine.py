@@ -0,0 +1,167 @@
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import ImageColor
+
+# WCAG 2.x minimum contrast ratios for normal text
+CONTRAST_LEVELS = {
+    "AA": 4.5,
+    "AAA": 7.0,
+}
+
+# sRGB channel value (0-255) -> linear light, computed once
+SRGB_TO_LINEAR = np.where(
+    np.arange(256) / 255.0 <= 0.04045,
+    np.arange(256) / 255.0 / 12.92,
+    ((np.arange(256) / 255.0 + 0.055) / 1.055) ** 2.4,
+)
+
+# Linear RGB -> CIE XYZ (D65) and the D65 reference white
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+def to_rgb_array(colors: Sequence[str]) -> np.ndarray:
+    """
+    Convert hex/named colors into an (n, 3) uint8 array
+    """
+    return np.array([ImageColor.getrgb(color)[:3] for color in colors], dtype=np.uint8).reshape(-1, 3)
+
+def to_hex(rgb: np.ndarray) -> str:
+    """
+    Format one RGB triple as #RRGGBB
+    """
+    return "#{:02X}{:02X}{:02X}".format(*(int(v) for v in rgb))
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    """
+    WCAG relative luminance of an (..., 3) uint8 array
+    """
+    linear = SRGB_TO_LINEAR[rgb]
+    return linear @ _RGB_TO_XYZ[1]
+
+def contrast_ratio(bg: np.ndarray, text: np.ndarray) -> np.ndarray:
+    """
+    WCAG contrast ratio (1-21) between matching rows of two color arrays
+    """
+    lum_bg = relative_luminance(bg)
+    lum_text = relative_luminance(text)
+    return (np.maximum(lum_bg, lum_text) + 0.05) / (np.minimum(lum_bg, lum_text) + 0.05)
+
+def to_lab(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convert an (..., 3) uint8 array to CIELAB
+    """
+    xyz = (SRGB_TO_LINEAR[rgb] @ _RGB_TO_XYZ.T) / _WHITE_D65
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+def delta_e(rgb1: np.ndarray, rgb2: np.ndarray) -> np.ndarray:
+    """
+    Perceptual distance (CIE76 delta E) between matching rows of two color arrays
+    """
+    return np.linalg.norm(to_lab(rgb1) - to_lab(rgb2), axis=-1)
+
+def _web_palette() -> np.ndarray:
+    """
+    The 216 web-safe colors as an (n, 3) uint8 array
+    """
+    steps = np.arange(0, 256, 51, dtype=np.uint8)
+    return np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1).reshape(-1, 3)
+
+# Candidate colors for suggestions
+PALETTE = _web_palette()
+
+def rank_color_schemes(bg: np.ndarray, text: np.ndarray, min_contrast: float = CONTRAST_LEVELS["AA"],
+                       reference: Optional[Tuple[str, str]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rank candidate (background, text) pairs in one vectorised pass.
+
+    bg and text are (n, 3) uint8 arrays of paired colors. Pairs below
+    min_contrast are dropped. With a reference scheme the remaining pairs
+    are ordered by perceptual distance to it (closest first), otherwise by
+    contrast (highest first).
+
+    Returns (order, contrast, distance): indices of the kept pairs in rank
+    order plus the contrast ratio and distance of every input pair.
+    """
+    contrast = contrast_ratio(bg, text)
+    if reference is not None:
+        ref = to_rgb_array(reference)
+        distance = delta_e(bg, ref[0]) + delta_e(text, ref[1])
+        key = distance
+    else:
+        distance = np.zeros(len(contrast))
+        key = -contrast
+    keep = np.flatnonzero(contrast >= min_contrast)
+    order = keep[np.argsort(key[keep], kind="stable")]
+    return order, contrast, distance
+
+def suggest_color_schemes(bg_color: str, text_color: str, top_n: int = 4,
+                          min_contrast: float = CONTRAST_LEVELS["AA"],
+                          extra_schemes: Sequence[Tuple[str, str]] = ()) -> List[Tuple[str, str, float]]:
+    """
+    Suggest the top_n readable schemes closest to the current colors.
+
+    Candidates keep one of the current colors and swap the other for a
+    palette color, plus any extra_schemes. The current scheme itself is
+    never suggested. Returns (bg, text, contrast).
+    """
+    current = to_rgb_array([bg_color, text_color])
+    extra = to_rgb_array([color for scheme in extra_schemes for color in scheme]).reshape(-1, 2, 3)
+    bg = np.concatenate([np.broadcast_to(current[0], PALETTE.shape), PALETTE, extra[:, 0]])
+    text = np.concatenate([PALETTE, np.broadcast_to(current[1], PALETTE.shape), extra[:, 1]])
+
+    order, contrast, _ = rank_color_schemes(bg, text, min_contrast, reference=(bg_color, text_color))
+
+    suggestions = []
+    seen = {(to_hex(current[0]), to_hex(current[1]))}
+    for i in order:
+        scheme = (to_hex(bg[i]), to_hex(text[i]))
+        if scheme not in seen:
+            seen.add(scheme)
+            suggestions.append(scheme + (float(contrast[i]),))
+        if len(suggestions) == top_n:
+            break
+    return suggestions
+
+def contrast_level(bg_color: str, text_color: str) -> Tuple[float, str]:
+    """
+    Contrast ratio of one scheme and the best WCAG level it meets ("AAA", "AA" or "Fail")
+    """
+    colors = to_rgb_array([bg_color, text_color])
+    ratio = float(contrast_ratio(colors[:1], colors[1:])[0])
+    if ratio >= CONTRAST_LEVELS["AAA"]:
+        return ratio, "AAA"
+    if ratio >= CONTRAST_LEVELS["AA"]:
+        return ratio, "AA"
+    return ratio, "Fail"
+
+def readable_mask(schemes: Sequence[Tuple[str, str]], min_contrast: float = CONTRAST_LEVELS["AA"]) -> np.ndarray:
+    """
+    Boolean array marking which (bg, text) schemes meet min_contrast
+    """
+    if not schemes:
+        return np.zeros(0, dtype=bool)
+    colors = to_rgb_array([color for scheme in schemes for color in scheme]).reshape(-1, 2, 3)
+    return contrast_ratio(colors[:, 0], colors[:, 1]) >= min_contrast
+
+if __name__ == "__main__":
+    # Rank every pairing of the web palette (46,656 schemes)
+    bg = np.repeat(PALETTE, len(PALETTE), axis=0)
+    text = np.tile(PALETTE, (len(PALETTE), 1))
+    start = time.perf_counter()
+    order, contrast, _ = rank_color_schemes(bg, text, reference=("#2C3E50", "#ECF0F1"))
+    print(f"Ranked {len(bg)} schemes in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({len(order)} pass AA)")
+    start = time.perf_counter()
+    suggestions = suggest_color_schemes("#2C3E50", "#7F8C8D")
+    print(f"Suggestions in {(time.perf_counter() - start) * 1000:.2f} ms: {suggestions}")
@@ -0,0 +1,121 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from PIL import Image, ImageColor, ImageDraw
+
+from uuus.background_generator import generate_background
+from uuus.font_manager import load_font
+from uuus.glyph_atlas import draw_text_line
+
+# Default canvas size for generated designs
+DESIGN_SIZE = (800, 500)
+
+@lru_cache(maxsize=512)
+def layout_text(text: str, font_name: str, font_size: int, alignment: str, padding: float,
+                line_spacing: float, size: Tuple[int, int] = DESIGN_SIZE) -> Tuple[Tuple[str, float, float], ...]:
+    """
+    Position each line of text on the canvas.
+
+    Returns a tuple of (line, x, y) for every line that gets drawn. The
+    result only depends on the arguments, so it is shared between reruns
+    and between variant renders.
+    """
+    width, height = size
+    font = load_font(font_name, font_size)
+
+    # Handle multiline text for large fonts
+    lines = text.split('\n')
+    total_height = 0
+    line_heights = []
+
+    # Calculate total height for all lines
+    for line in lines:
+        if line.strip():  # Only calculate for non-empty lines
+            text_bbox = font.getbbox(line)
+            line_height = text_bbox[3] - text_bbox[1]
+            line_heights.append(line_height)
+            total_height += line_height * line_spacing
+        else:
+            line_heights.append(0)
+
+    # If no lines with text, use single line
+    if total_height == 0:
+        text_bbox = font.getbbox(text)
+        total_height = (text_bbox[3] - text_bbox[1]) * line_spacing
+        lines = [text]
+        line_heights = [text_bbox[3] - text_bbox[1]]
+
+    # Calculate starting Y position
+    current_y = (height - total_height) / 2
+
+    placed = []
+    for i, line in enumerate(lines):
+        if line.strip():  # Only draw non-empty lines
+            text_bbox = font.getbbox(line)
+            text_width = text_bbox[2] - text_bbox[0]
+
+            # Set x position based on alignment
+            if alignment == "Left":
+                x = padding
+            elif alignment == "Center":
+                x = (width - text_width) / 2
+            else:  # Right
+                x = width - text_width - padding
+
+            placed.append((line, x, current_y))
+            current_y += line_heights[i] * line_spacing
+
+    return tuple(placed)
+
+@lru_cache(maxsize=64)
+def text_mask(text: str, font_name: str, font_size: int, alignment: str, padding: float,
+              line_spacing: float, size: Tuple[int, int] = DESIGN_SIZE,
+              text_backend: str = "ImageDraw") -> Tuple[Optional[Image.Image], Tuple[int, int]]:
+    """
+    Rasterise the laid-out text once into an 8-bit coverage mask.
+
+    Returns (mask, offset) where the mask is cropped to the inked area,
+    or (None, (0, 0)) when nothing is drawn. Designs that differ only in
+    colors or background share the same mask, so FreeType runs once per
+    text/font/size/layout combination. Treat the mask as read-only.
+
+    text_backend is "ImageDraw" or "Glyph Atlas" (see uuus.glyph_atlas).
+    """
+    mask = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(mask)
+    font = load_font(font_name, font_size)
+
+    for line, x, y in layout_text(text, font_name, font_size, alignment, padding, line_spacing, size):
+        if text_backend == "Glyph Atlas":
+            draw_text_line(mask, (x, y), line, font_name, font_size)
+        else:
+            draw.text((x, y), line, font=font, fill=255)
+
+    bbox = mask.getbbox()
+    if bbox is None:
+        return None, (0, 0)
+    return mask.crop(bbox), bbox[:2]
+
+def render_design(text: str, font_name: str, font_size: int, text_color: str, bg_color: str,
+                  alignment: str = "Center", padding: float = 50, line_spacing: float = 1.5,
+                  bg_style: str = "Solid", bg_color2: str = "#000000", bg_angle: float = 90,
+                  bg_intensity: int = 12, size: Tuple[int, int] = DESIGN_SIZE,
+                  text_backend: str = "ImageDraw", background: Optional[Image.Image] = None) -> Image.Image:
+    """
+    Render a design to an RGB image.
+
+    background is an optional canvas-sized RGB image (e.g. an uploaded
+    photo) used instead of the generated bg_style background.
+    """
+    if background is not None:
+        img = background.copy()
+    else:
+        img = generate_background(bg_style, size, bg_color, bg_color2,
+                                  angle=bg_angle, intensity=bg_intensity)
+    mask, offset = text_mask(text, font_name, font_size, alignment, padding, line_spacing, tuple(size),
+                             text_backend)
+    if mask is not None:
+        box = offset + (offset[0] + mask.width, offset[1] + mask.height)
+        img.paste(ImageColor.getrgb(text_color)[:3], box, mask)
+
+    return img
@@ -0,0 +1,103 @@
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from PIL import ImageFont
+
+# Available fonts dictionary
+FONT_STYLES = {
+    "Arial": "arial",
+    "Arial Bold": "arialbd",
+    "Times New Roman": "times",
+    "Georgia": "georgia",
+    "Verdana": "verdana",
+    "Courier New": "cour",
+    "Trebuchet MS": "trebuc",
+    "Comic Sans MS": "comic",
+    "Impact": "impact",
+    "Tahoma": "tahoma",
+    "Lucida Console": "lucon",
+    "Palatino": "pala",
+    "Garamond": "gara",
+    "Bookman": "bookman"
+}
+
+# Font categories for better organization
+FONT_CATEGORIES = {
+    "Sans-serif": ["Arial", "Arial Bold", "Verdana", "Tahoma", "Trebuchet MS"],
+    "Serif": ["Times New Roman", "Georgia", "Palatino", "Garamond", "Bookman"],
+    "Monospace": ["Courier New", "Lucida Console"],
+    "Casual": ["Comic Sans MS", "Impact"]
+}
+
+def detect_available_fonts():
+    """Detect which fonts are available on the system"""
+    available = {}
+    
+    # Always include all fonts from our dictionary
+    for font_name in FONT_STYLES.keys():
+        available[font_name] = FONT_STYLES[font_name]
+    
+    return available
+
+def _font_file_variations(font_name):
+    """
+    File names to try for a font, most likely first
+    """
+    font_file_base = FONT_STYLES.get(font_name, "arial")
+    
+    # Common variations to try
+    font_variations = [
+        font_file_base + ".ttf",  # Most common
+        font_file_base,  # Just the name
+        font_file_base.upper() + ".ttf",  # Uppercase
+        font_file_base.capitalize() + ".ttf",  # Capitalized
+    ]
+    
+    # For specific fonts, add more variations
+    if "Arial" in font_name:
+        font_variations.extend(["arial.ttf", "Arial.ttf", "ARIAL.TTF"])
+    elif "Times" in font_name:
+        font_variations.extend(["times.ttf", "Times.ttf", "timesbd.ttf"])
+    elif "Comic" in font_name:
+        font_variations.extend(["comic.ttf", "Comic.ttf", "comicbd.ttf"])
+    
+    # If all else fails, try a default truetype font
+    font_variations.append("arial.ttf")
+    return font_variations
+
+@lru_cache(maxsize=None)
+def resolve_font_path(font_name) -> Optional[str]:
+    """
+    Find the font file for a font name once; None means use the default font
+    """
+    for font_variation in _font_file_variations(font_name):
+        try:
+            return ImageFont.truetype(font_variation, 12).path
+        except Exception:
+            continue
+    return None
+
+# FreeType faces are not safe to share between threads, so each worker
+# thread keeps its own (font, size) cache on top of the shared path lookup
+_thread_fonts = threading.local()
+
+def load_font(font_name, font_size):
+    """Load font with fallback handling - cached per thread"""
+    fonts = getattr(_thread_fonts, "fonts", None)
+    if fonts is None:
+        fonts = _thread_fonts.fonts = {}
+    
+    key = (font_name, font_size)
+    if key not in fonts:
+        try:
+            font_path = resolve_font_path(font_name)
+            if font_path:
+                fonts[key] = ImageFont.truetype(font_path, font_size)
+            else:
+                # Last resort: load_default() doesn't accept a size on older Pillow
+                fonts[key] = ImageFont.load_default()
+        except Exception:
+            # Ultimate fallback
+            fonts[key] = ImageFont.load_default()
+    return fonts[key]
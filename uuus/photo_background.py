@@ -0,0 +1,177 @@
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Tuple, Union
+
+from PIL import Image, ImageOps
+
+# File types accepted by the photo uploader
+PHOTO_TYPES = ["jpg", "jpeg", "png", "webp"]
+
+# Fitted backgrounds kept in memory, keyed by upload and canvas size
+MAX_CACHED_PHOTOS = 8
+
+# Color shown through transparent areas of PNG/WebP uploads
+MATTE_COLOR = "#FFFFFF"
+
+# Bytes hashed per step, so large uploads are never copied in one piece
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# EXIF orientations that swap width and height
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+_photo_cache = OrderedDict()
+_photo_cache_lock = threading.Lock()
+
+def _buffer(source: Union[bytes, BinaryIO]) -> memoryview:
+    """
+    Zero-copy view of an upload (Streamlit UploadedFile, BytesIO or bytes)
+    """
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer()
+    return memoryview(source)
+
+def content_hash(source: Union[bytes, BinaryIO]) -> str:
+    """
+    SHA-256 of the upload, hashed in chunks straight from its buffer
+    """
+    digest = hashlib.sha256()
+    with _buffer(source) as view:
+        for start in range(0, view.nbytes, HASH_CHUNK_SIZE):
+            digest.update(view[start:start + HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+def upload_key(source: Union[bytes, BinaryIO]) -> str:
+    """
+    Cache key for an upload: Streamlit's file_id when present, else a content hash
+    """
+    # file_id is fixed for an upload across reruns, so the bytes aren't re-hashed
+    file_id = getattr(source, "file_id", None)
+    if file_id:
+        return f"file:{file_id}"
+    return f"sha256:{content_hash(source)}"
+
+def _cover_box(image_size: Tuple[int, int], size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+    """
+    Centered crop of the source with the canvas aspect ratio
+    """
+    src_w, src_h = image_size
+    width, height = size
+    scale = max(width / src_w, height / src_h)
+    crop_w, crop_h = width / scale, height / scale
+    left = (src_w - crop_w) / 2
+    top = (src_h - crop_h) / 2
+    return (left, top, left + crop_w, top + crop_h)
+
+def _decode_fitted(source: Union[bytes, BinaryIO], size: Tuple[int, int]) -> Tuple[Image.Image, Dict]:
+    """
+    Decode an upload directly at (close to) canvas resolution and cover-fit it
+    """
+    start = time.perf_counter()
+    with _buffer(source) as view:
+        upload_bytes = view.nbytes
+
+    # Read straight from the upload object; BytesIO(bytes) shares the buffer too
+    if hasattr(source, "seek"):
+        source.seek(0)
+        stream = source
+    else:
+        stream = io.BytesIO(source)
+
+    with Image.open(stream) as image:
+        full_size = image.size
+        orientation = image.getexif().get(0x0112, 1)
+
+        # JPEG draft mode lets libjpeg decode at 1/2, 1/4 or 1/8 scale
+        target = size if orientation not in _ROTATED_ORIENTATIONS else (size[1], size[0])
+        if image.format == "JPEG":
+            scale = max(target[0] / full_size[0], target[1] / full_size[1])
+            image.draft("RGB", (max(1, round(full_size[0] * scale)), max(1, round(full_size[1] * scale))))
+        decoded_size = image.size
+
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            # Composite onto the matte so hidden RGB under transparent pixels never shows
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, MATTE_COLOR)
+            image.paste(rgba, mask=rgba)
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        # reducing_gap shrinks by whole factors first, then resamples the rest
+        fitted = image.resize(size, Image.Resampling.LANCZOS,
+                              box=_cover_box(image.size, size), reducing_gap=2.0)
+
+    stats = {
+        "upload_bytes": upload_bytes,
+        "full_size": full_size,
+        "full_bytes": full_size[0] * full_size[1] * 3,
+        "decoded_size": decoded_size,
+        "decoded_bytes": decoded_size[0] * decoded_size[1] * 3,
+        "fitted_bytes": size[0] * size[1] * 3,
+        "decode_ms": (time.perf_counter() - start) * 1000,
+    }
+    return fitted, stats
+
+def load_photo_background(source: Union[bytes, BinaryIO], size: Tuple[int, int]) -> Tuple[Image.Image, Dict]:
+    """
+    Photo fitted to the canvas (cover), cached by upload_key.
+
+    Returns (image, stats). The image is a private copy that is safe to
+    draw on. stats describes the decode relative to the upload size and
+    has "cached" set when the fitted photo came from the cache.
+    """
+    key = (upload_key(source), tuple(size))
+    with _photo_cache_lock:
+        entry = _photo_cache.get(key)
+        if entry is not None:
+            _photo_cache.move_to_end(key)
+
+    if entry is None:
+        entry = _decode_fitted(source, tuple(size))
+        with _photo_cache_lock:
+            _photo_cache[key] = entry
+            while len(_photo_cache) > MAX_CACHED_PHOTOS:
+                _photo_cache.popitem(last=False)
+        cached = False
+    else:
+        cached = True
+
+    image, stats = entry
+    return image.copy(), dict(stats, cached=cached)
+
+def clear_photo_cache():
+    """
+    Drop all cached photo backgrounds
+    """
+    with _photo_cache_lock:
+        _photo_cache.clear()
+
+def describe_stats(stats: Dict) -> str:
+    """
+    One-line summary of decode cost relative to the upload
+    """
+    megabyte = 1024 * 1024
+    upload = stats["upload_bytes"]
+    if stats.get("cached"):
+        return f"{upload / megabyte:.1f} MB upload · served from cache"
+    full_w, full_h = stats["full_size"]
+    dec_w, dec_h = stats["decoded_size"]
+    return (
+        f"{upload / megabyte:.1f} MB upload ({full_w}×{full_h}) → decoded at {dec_w}×{dec_h}, "
+        f"{stats['decoded_bytes'] / megabyte:.1f} MB ({stats['decoded_bytes'] / max(upload, 1):.1f}× upload, "
+        f"vs {stats['full_bytes'] / max(upload, 1):.1f}× for a full decode) in {stats['decode_ms']:.0f} ms"
+    )
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        with open(path, "rb") as handle:
+            upload = io.BytesIO(handle.read())
+        clear_photo_cache()
+        for _ in range(2):
+            _, photo_stats = load_photo_background(upload, (800, 500))
+            print(f"{path}: {describe_stats(photo_stats)}")
@@ -0,0 +1,203 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageColor
+
+from uuus.background_generator import background_view
+from uuus.design_renderer import DESIGN_SIZE, layout_text, render_design, text_mask
+from uuus.font_manager import load_font
+from uuus.glyph_atlas import clear_atlases, draw_text_line
+
+# Upper bound on grid size so a careless selection can't stall the app
+MAX_VARIANTS = 96
+
+# Scale of each contact-sheet cell relative to the full design
+CELL_SCALE = 0.5
+
+# Height of the caption strip under each cell
+LABEL_HEIGHT = 22
+
+# Caption font and size; captions go through the glyph atlas like cell text
+LABEL_FONT = ("Arial", 12)
+
+# Shared pool so worker threads (and their font caches) survive reruns
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="variant")
+
+def build_variants(color_schemes: Sequence[Tuple[str, str]], fonts: Sequence[str],
+                   sizes: Sequence[int]) -> List[Dict]:
+    """
+    Expand color schemes x fonts x sizes into a list of variant settings
+    """
+    variants = []
+    for (bg_color, text_color), font_name, font_size in product(color_schemes, fonts, sizes):
+        variants.append({
+            "bg_color": bg_color,
+            "text_color": text_color,
+            "font_name": font_name,
+            "font_size": font_size,
+        })
+    return variants[:MAX_VARIANTS]
+
+def _label_parts(index: int, variant: Dict) -> Tuple[str, str, str]:
+    """
+    Caption split into index, font/size and colors; only the index is unique per cell
+    """
+    return (f"#{index + 1} ", f"{variant['font_name']} {variant['font_size']}px ",
+            f"{variant['bg_color']}/{variant['text_color']}")
+
+def variant_label(index: int, variant: Dict) -> str:
+    """
+    Short caption identifying a variant on the contact sheet
+    """
+    return "".join(_label_parts(index, variant))
+
+@lru_cache(maxsize=8 * MAX_VARIANTS)
+def _caption_segment(segment: str) -> Tuple[Image.Image, float]:
+    """
+    Coverage mask and advance of one caption part, drawn through the glyph atlas.
+
+    Font/size and color parts repeat across a grid, so each is drawn once
+    and shared by every caption that contains it.
+    """
+    font = load_font(*LABEL_FONT)
+    advance = font.getlength(segment)
+    mask = Image.new('L', (math.ceil(advance) + 4, LABEL_HEIGHT), 0)
+    draw_text_line(mask, (2, 4), segment, *LABEL_FONT)
+    return mask, advance
+
+def _mask_args(text: str, variant: Dict, settings: Dict, cell_size: Tuple[int, int]) -> Tuple:
+    """
+    text_mask arguments for one variant at contact-sheet scale
+    """
+    scale = cell_size[0] / DESIGN_SIZE[0]
+    return (
+        text,
+        variant["font_name"],
+        max(1, round(variant["font_size"] * scale)),
+        settings.get("alignment", "Center"),
+        settings.get("padding", 50) * scale,
+        settings.get("line_spacing", 1.5),
+        cell_size,
+        settings.get("text_backend", "Glyph Atlas"),
+    )
+
+def render_contact_sheet(text: str, variants: Sequence[Dict], settings: Optional[Dict] = None,
+                         columns: int = 4, gap: int = 12) -> Image.Image:
+    """
+    Render all variants and tile them into one contact sheet.
+
+    settings holds the layout and background options shared by every
+    variant (alignment, padding, line_spacing, bg_style, ...). Text goes
+    through the glyph atlas unless settings["text_backend"] says otherwise,
+    and settings["background"] may hold a photo at full design size.
+
+    Text masks are rasterised in parallel, once per distinct font and
+    size, and every cell is composited straight into the sheet from the
+    cached background and mask, giving the same pixels as render_design
+    at cell size without a per-cell image.
+    """
+    settings = dict(settings or {})
+    cell_size = (round(DESIGN_SIZE[0] * CELL_SCALE), round(DESIGN_SIZE[1] * CELL_SCALE))
+
+    # Scale a photo background down once rather than in every cell
+    if settings.get("background") is not None:
+        settings["background"] = settings["background"].resize(cell_size, Image.Resampling.LANCZOS)
+
+    # Rasterise each distinct font/size once, in parallel; variants that
+    # differ only in colors share the mask (lru_cache alone would let
+    # concurrent misses for the same key all run FreeType)
+    mask_args = [_mask_args(text, variant, settings, cell_size) for variant in variants]
+    unique_args = list(dict.fromkeys(mask_args))
+    masks = dict(zip(unique_args, _executor.map(lambda args: text_mask(*args), unique_args)))
+
+    columns = max(1, min(columns, len(variants)))
+    rows = math.ceil(len(variants) / columns) if variants else 0
+    cell_w, cell_h = cell_size
+    sheet = Image.new(
+        'RGB',
+        (gap + columns * (cell_w + gap), gap + rows * (cell_h + LABEL_HEIGHT + gap)),
+        color='#f0f2f6'
+    )
+
+    # Composite each cell straight into the sheet: the cached background
+    # view, then the text color through the shared mask
+    for i, variant in enumerate(variants):
+        row, col = divmod(i, columns)
+        x = gap + col * (cell_w + gap)
+        y = gap + row * (cell_h + LABEL_HEIGHT + gap)
+        background = settings.get("background")
+        if background is None:
+            background = background_view(
+                settings.get("bg_style", "Solid"),
+                cell_size,
+                variant["bg_color"],
+                settings.get("bg_color2", "#000000"),
+                angle=settings.get("bg_angle", 90),
+                intensity=settings.get("bg_intensity", 12),
+            )
+        sheet.paste(background, (x, y))
+        mask, offset = masks[mask_args[i]]
+        if mask is not None:
+            left, top = x + offset[0], y + offset[1]
+            sheet.paste(ImageColor.getrgb(variant["text_color"])[:3],
+                        (left, top, left + mask.width, top + mask.height), mask)
+        pen = float(x)
+        for segment in _label_parts(i, variant):
+            caption, advance = _caption_segment(segment)
+            left = round(pen)
+            visible = min(caption.width, x + cell_w - left)
+            if visible <= 0:
+                break
+            sheet.paste("#333333", (left, y + cell_h, left + visible, y + cell_h + LABEL_HEIGHT),
+                        caption.crop((0, 0, visible, LABEL_HEIGHT)))
+            pen += advance
+
+    return sheet
+
+def benchmark_contact_sheet(text: str = "DESIGN YOUR VISION", repeats: int = 5) -> Dict[str, float]:
+    """
+    Milliseconds for one cold render_design and for a 48-variant sheet, cold and warm.
+
+    "Cold" clears the text layout, mask, caption and glyph caches first,
+    so FreeType runs again; backgrounds and loaded fonts stay cached.
+    """
+    schemes = [("#2C3E50", "#FFFFFF"), ("#000000", "#FFD700"), ("#FFFFFF", "#FF0000"),
+               ("#000080", "#FFFFFF"), ("#008000", "#FFFFFF"), ("#800080", "#FFFFFF"),
+               ("#000000", "#FFFFFF"), ("#0000FF", "#FFFF00")]
+    variants = build_variants(schemes, ["Arial", "Georgia"], [50, 70, 100])
+
+    def clear():
+        layout_text.cache_clear()
+        text_mask.cache_clear()
+        _caption_segment.cache_clear()
+        clear_atlases()
+
+    def best(run, cold):
+        times = []
+        for _ in range(repeats):
+            if cold:
+                clear()
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+        return min(times)
+
+    render_contact_sheet(text, variants)
+    return {
+        "variants": len(variants),
+        "single_cold_ms": best(lambda: render_design(text, "Arial", 70, "#FFFFFF", "#2C3E50"), cold=True),
+        "sheet_cold_ms": best(lambda: render_contact_sheet(text, variants), cold=True),
+        "sheet_warm_ms": best(lambda: render_contact_sheet(text, variants), cold=False),
+    }
+
+if __name__ == "__main__":
+    result = benchmark_contact_sheet()
+    single = result["single_cold_ms"]
+    print(f"Single design (cold): {single:.2f} ms")
+    for key in ["sheet_cold_ms", "sheet_warm_ms"]:
+        print(f"{result['variants']} variants ({key.split('_')[1]}): {result[key]:.1f} ms = "
+              f"{result[key] / single:.1f}x a cold single render")
@@ -0,0 +1,433 @@
+import base64
+import io
+import math
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from PIL import Image, ImageColor, ImageFont
+
+from uuus.background_generator import generate_background
+from uuus.design_renderer import DESIGN_SIZE, layout_text, render_design
+from uuus.font_manager import load_font
+from uuus.glyph_atlas import needs_shaping
+
+def _hex(color: str) -> str:
+    """
+    Normalise any PIL color string to #RRGGBB
+    """
+    return "#{:02X}{:02X}{:02X}".format(*ImageColor.getrgb(color)[:3])
+
+def _pdf_rgb(color: str) -> str:
+    """
+    PDF color operands (0-1) for a color string
+    """
+    return " ".join(f"{c / 255:.4f}" for c in ImageColor.getrgb(color)[:3])
+
+def _num(value: float) -> str:
+    """
+    Compact number formatting for SVG/PDF output
+    """
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+def font_data(font) -> bytes:
+    """
+    TrueType bytes behind a loaded font, including Pillow's built-in default
+    """
+    path = getattr(font, "path", None)
+    if hasattr(path, "getvalue"):
+        return path.getvalue()
+    if isinstance(path, str):
+        with open(path, "rb") as handle:
+            return handle.read()
+    raise ValueError("Vector export needs a TrueType font, but only Pillow's bitmap font is available")
+
+def font_bytes(data: bytes, chars: str) -> Tuple[bytes, bool]:
+    """
+    Font data to embed, subset to chars when fontTools is installed.
+
+    Returns (data, subset) where subset tells whether subsetting happened.
+    """
+    try:
+        from fontTools import subset
+
+        options = subset.Options()
+        options.name_IDs = ["*"]
+        options.notdef_outline = True
+        options.drop_tables += ["FFTM"]
+        font = subset.load_font(io.BytesIO(data), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=chars)
+        subsetter.subset(font)
+        buffer = io.BytesIO()
+        subset.save_font(font, buffer, options)
+        return buffer.getvalue(), True
+    except Exception:
+        return data, False
+
+def _cmap_lookup(data: bytes, offset: int, code: int) -> int:
+    """
+    Glyph index for one code point in a format 4 or 12 cmap subtable
+    """
+    if struct.unpack_from(">H", data, offset)[0] == 12:
+        for group in range(struct.unpack_from(">I", data, offset + 12)[0]):
+            start, end, glyph = struct.unpack_from(">III", data, offset + 16 + 12 * group)
+            if start <= code <= end:
+                return glyph + code - start
+        return 0
+
+    seg_count = struct.unpack_from(">H", data, offset + 6)[0] // 2
+    ends = offset + 14
+    starts = ends + 2 * seg_count + 2
+    deltas = starts + 2 * seg_count
+    range_offsets = deltas + 2 * seg_count
+    for seg in range(seg_count):
+        if struct.unpack_from(">H", data, ends + 2 * seg)[0] < code:
+            continue
+        start = struct.unpack_from(">H", data, starts + 2 * seg)[0]
+        if code < start:
+            return 0
+        delta = struct.unpack_from(">h", data, deltas + 2 * seg)[0]
+        range_offset = struct.unpack_from(">H", data, range_offsets + 2 * seg)[0]
+        if range_offset == 0:
+            return (code + delta) & 0xFFFF
+        glyph = struct.unpack_from(">H", data, range_offsets + 2 * seg + range_offset + 2 * (code - start))[0]
+        return (glyph + delta) & 0xFFFF if glyph else 0
+    return 0
+
+def glyph_ids(data: bytes, chars: str) -> Dict[str, int]:
+    """
+    Glyph index of each character in a TrueType font; 0 (.notdef) when missing, as FreeType draws it
+    """
+    tables = {}
+    for i in range(struct.unpack_from(">H", data, 4)[0]):
+        tag, _, table_offset, _ = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag] = table_offset
+    cmap = tables[b"cmap"]
+
+    # Prefer full-Unicode (format 12) subtables, then BMP (format 4) ones
+    subtables = {}
+    for i in range(struct.unpack_from(">H", data, cmap + 2)[0]):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + 8 * i)
+        if struct.unpack_from(">H", data, cmap + offset)[0] in (4, 12):
+            subtables[(platform, encoding)] = cmap + offset
+    preferred = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)]
+    offset = next((subtables[key] for key in preferred if key in subtables), None)
+
+    ids = {}
+    for char in chars:
+        code = ord(char)
+        if offset is None or (code > 0xFFFF and struct.unpack_from(">H", data, offset)[0] == 4):
+            ids[char] = 0
+        else:
+            ids[char] = _cmap_lookup(data, offset, code)
+    return ids
+
+def glyph_positions(text: str, font_name: str, font_size: int, alignment: str = "Center",
+                    padding: float = 50, line_spacing: float = 1.5,
+                    size: Tuple[int, int] = DESIGN_SIZE) -> List[Tuple[str, List[float], float]]:
+    """
+    Pen positions for every glyph, matching the raster renderer.
+
+    Returns a list of (line, x positions, baseline y). Each x is the pen
+    position PIL uses for that character, kerning with the previous
+    character included. Positions are in the units of the font load_font
+    actually returned, so use its .size for the exported text size.
+
+    Raises ValueError when the raster renderer shapes the text (raqm
+    layout, or scripts that need shaping), since ligatures, GPOS kerning
+    and reordering can't be reproduced one character at a time.
+    """
+    font = load_font(font_name, font_size)
+    if getattr(font, "layout_engine", None) == ImageFont.Layout.RAQM:
+        raise ValueError("Vector export needs basic text layout, but this Pillow build shapes text with raqm")
+    ascent = font.getmetrics()[0] if hasattr(font, "getmetrics") else 0
+
+    positions = []
+    for line, x, y in layout_text(text, font_name, font_size, alignment, padding, line_spacing, tuple(size)):
+        if needs_shaping(line):
+            raise ValueError(f"Vector export can't place text that needs shaping: {line!r}")
+        xs = [x + font.getlength(line[:i + 1]) - font.getlength(line[i]) for i in range(len(line))]
+        positions.append((line, xs, y + ascent))
+    return positions
+
+def _background_png(bg_style, size, bg_color, bg_color2, bg_angle, bg_intensity) -> bytes:
+    """
+    Raster fallback for backgrounds with no vector equivalent
+    """
+    buffer = io.BytesIO()
+    generate_background(bg_style, size, bg_color, bg_color2,
+                        angle=bg_angle, intensity=bg_intensity).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def _photo_jpeg(background: Image.Image) -> bytes:
+    """
+    JPEG bytes for embedding a photo background
+    """
+    buffer = io.BytesIO()
+    background.convert("RGB").save(buffer, format='JPEG', quality=90)
+    return buffer.getvalue()
+
+def _gradient_line(size: Tuple[int, int], angle: float) -> Tuple[float, float, float, float]:
+    """
+    Start and end points of a linear gradient matching the raster generator
+    """
+    width, height = size
+    theta = math.radians(angle)
+    dx = math.cos(theta) * width
+    dy = math.sin(theta) * height
+    # Raster field is (col * dx / (w - 1) + row * dy / (h - 1) - lo) / (hi - lo)
+    gx = dx / max(width - 1, 1)
+    gy = dy / max(height - 1, 1)
+    lo = min(0.0, dx) + min(0.0, dy)
+    hi = max(0.0, dx) + max(0.0, dy)
+    norm = max(gx * gx + gy * gy, 1e-12)
+    # Pixel centers sit at +0.5 in vector coordinates
+    return (gx * lo / norm + 0.5, gy * lo / norm + 0.5, gx * hi / norm + 0.5, gy * hi / norm + 0.5)
+
+def _stripe_band(size: Tuple[int, int]) -> float:
+    """
+    Stripe width used by the raster generator
+    """
+    return max(min(size) / 12.0, 1.0)
+
+def design_to_svg(text: str, font_name: str, font_size: int, text_color: str, bg_color: str,
+                  alignment: str = "Center", padding: float = 50, line_spacing: float = 1.5,
+                  bg_style: str = "Solid", bg_color2: str = "#000000", bg_angle: float = 90,
+                  bg_intensity: int = 12, size: Tuple[int, int] = DESIGN_SIZE,
+                  background: Optional[Image.Image] = None) -> str:
+    """
+    Export a design as SVG with the font embedded, without rasterising the text.
+
+    A photo background is embedded as JPEG.
+    """
+    width, height = size
+    lines = glyph_positions(text, font_name, font_size, alignment, padding, line_spacing, size)
+    color1, color2 = _hex(bg_color), _hex(bg_color2)
+
+    defs = []
+    if background is not None:
+        data = base64.b64encode(_photo_jpeg(background))
+        backdrop = (f'<image width="{width}" height="{height}" '
+                    f'href="data:image/jpeg;base64,{data.decode("ascii")}"/>')
+    elif bg_style == "Solid":
+        backdrop = f'<rect width="{width}" height="{height}" fill="{color1}"/>'
+    elif bg_style in ["Linear Gradient", "Duotone"]:
+        x1, y1, x2, y2 = _gradient_line(size, bg_angle)
+        if bg_style == "Duotone":
+            stops = (f'<stop offset="0.5" stop-color="{color1}"/>'
+                     f'<stop offset="0.5" stop-color="{color2}"/>')
+        else:
+            stops = f'<stop offset="0" stop-color="{color1}"/><stop offset="1" stop-color="{color2}"/>'
+        defs.append(f'<linearGradient id="bg" gradientUnits="userSpaceOnUse" x1="{_num(x1)}" y1="{_num(y1)}" '
+                    f'x2="{_num(x2)}" y2="{_num(y2)}">{stops}</linearGradient>')
+        backdrop = f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+    elif bg_style == "Radial Gradient":
+        defs.append(f'<radialGradient id="bg" gradientUnits="userSpaceOnUse" cx="{_num(width / 2)}" '
+                    f'cy="{_num(height / 2)}" r="{_num(math.hypot(width, height) / 2)}">'
+                    f'<stop offset="0" stop-color="{color1}"/><stop offset="1" stop-color="{color2}"/>'
+                    f'</radialGradient>')
+        backdrop = f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+    elif bg_style == "Stripes":
+        band = _stripe_band(size)
+        defs.append(f'<pattern id="bg" patternUnits="userSpaceOnUse" width="{_num(2 * band)}" '
+                    f'height="{_num(2 * band)}" patternTransform="rotate({_num(bg_angle)})">'
+                    f'<rect width="{_num(band)}" height="{_num(2 * band)}" fill="{color1}"/>'
+                    f'<rect x="{_num(band)}" width="{_num(band)}" height="{_num(2 * band)}" fill="{color2}"/>'
+                    f'</pattern>')
+        backdrop = f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+    else:
+        data = base64.b64encode(_background_png(bg_style, size, bg_color, bg_color2, bg_angle, bg_intensity))
+        backdrop = (f'<image width="{width}" height="{height}" '
+                      f'href="data:image/png;base64,{data.decode("ascii")}"/>')
+
+    # Embed the font the raster renderer used, even when it is Pillow's default
+    font = load_font(font_name, font_size)
+    chars = "".join(sorted(set("".join(line for line, _, _ in lines)))) or " "
+    data, _ = font_bytes(font_data(font), chars)
+    defs.append(f'<style>@font-face {{ font-family: "DesignFont"; '
+                f'src: url(data:font/ttf;base64,{base64.b64encode(data).decode("ascii")}); }}</style>')
+    family = "DesignFont, sans-serif"
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+    ]
+    if defs:
+        parts.append("<defs>" + "".join(defs) + "</defs>")
+    parts.append(backdrop)
+    parts.append(f'<g font-family={quoteattr(family)} font-size="{font.size}" fill="{_hex(text_color)}" '
+                 f'xml:space="preserve">')
+    for line, xs, baseline in lines:
+        parts.append(f'<text x="{" ".join(_num(x) for x in xs)}" y="{_num(baseline)}">{escape(line)}</text>')
+    parts.append("</g></svg>")
+    return "\n".join(parts)
+
+def _to_unicode_cmap(cids: Dict[str, int]) -> bytes:
+    """
+    ToUnicode CMap so text extracted from the PDF matches the design text
+    """
+    entries = "\n".join(f"<{cid:04X}> <{char.encode('utf-16-be').hex().upper()}>"
+                         for char, cid in sorted(cids.items(), key=lambda item: item[1]))
+    return (
+        "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        f"{len(cids)} beginbfchar\n{entries}\nendbfchar\n"
+        "endcmap\nCMapName currentdict /CMap defineresource pop\nend\nend"
+    ).encode()
+
+def design_to_pdf(text: str, font_name: str, font_size: int, text_color: str, bg_color: str,
+                  alignment: str = "Center", padding: float = 50, line_spacing: float = 1.5,
+                  bg_style: str = "Solid", bg_color2: str = "#000000", bg_angle: float = 90,
+                  bg_intensity: int = 12, size: Tuple[int, int] = DESIGN_SIZE,
+                  background: Optional[Image.Image] = None) -> bytes:
+    """
+    Export a design as a single-page PDF (1 px = 1 pt) with the font embedded.
+
+    A photo background is embedded as JPEG.
+    """
+    width, height = size
+    lines = glyph_positions(text, font_name, font_size, alignment, padding, line_spacing, size)
+    objects = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    resources = []
+    # Work in a y-down coordinate system like PIL and SVG
+    content = [f"1 0 0 -1 0 {height} cm".encode()]
+
+    if background is not None:
+        data = _photo_jpeg(background)
+        xobject = add(f"<< /Type /XObject /Subtype /Image /Width {background.width} "
+                      f"/Height {background.height} /ColorSpace /DeviceRGB /BitsPerComponent 8 "
+                      f"/Filter /DCTDecode /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream")
+        resources.append(f"/XObject << /Im1 {xobject} 0 R >>")
+        content.append(f"q {width} 0 0 -{height} 0 {height} cm /Im1 Do Q".encode())
+    elif bg_style == "Solid":
+        content.append(f"{_pdf_rgb(bg_color)} rg 0 0 {width} {height} re f".encode())
+    elif bg_style in ["Linear Gradient", "Duotone", "Radial Gradient"]:
+        ramp = f"<< /FunctionType 2 /Domain [0 1] /C0 [{_pdf_rgb(bg_color)}] /C1 [{_pdf_rgb(bg_color2)}] /N 1 >>"
+        if bg_style == "Duotone":
+            solid1 = f"<< /FunctionType 2 /Domain [0 1] /C0 [{_pdf_rgb(bg_color)}] /C1 [{_pdf_rgb(bg_color)}] /N 1 >>"
+            solid2 = f"<< /FunctionType 2 /Domain [0 1] /C0 [{_pdf_rgb(bg_color2)}] /C1 [{_pdf_rgb(bg_color2)}] /N 1 >>"
+            ramp = (f"<< /FunctionType 3 /Domain [0 1] /Functions [{solid1} {solid2}] "
+                    f"/Bounds [0.5] /Encode [0 1 0 1] >>")
+        if bg_style == "Radial Gradient":
+            coords = [width / 2, height / 2, 0, width / 2, height / 2, math.hypot(width, height) / 2]
+            shading_type = 3
+        else:
+            coords = list(_gradient_line(size, bg_angle))
+            shading_type = 2
+        shading = add(f"<< /ShadingType {shading_type} /ColorSpace /DeviceRGB "
+                      f"/Coords [{' '.join(_num(c) for c in coords)}] /Function {ramp} "
+                      f"/Extend [true true] >>".encode())
+        resources.append(f"/Shading << /Sh1 {shading} 0 R >>")
+        content.append(f"q 0 0 {width} {height} re W n /Sh1 sh Q".encode())
+    elif bg_style == "Stripes":
+        band = _stripe_band(size)
+        theta = math.radians(bg_angle)
+        reach = math.hypot(width, height)
+        content.append(f"{_pdf_rgb(bg_color)} rg 0 0 {width} {height} re f".encode())
+        content.append(f"q 0 0 {width} {height} re W n".encode())
+        content.append(f"{_num(math.cos(theta))} {_num(math.sin(theta))} {_num(-math.sin(theta))} "
+                       f"{_num(math.cos(theta))} 0 0 cm {_pdf_rgb(bg_color2)} rg".encode())
+        start = -int(reach // (2 * band)) - 1
+        for k in range(start, -start + 1):
+            content.append(f"{_num((2 * k + 1) * band)} {_num(-reach)} {_num(band)} {_num(2 * reach)} re".encode())
+        content.append(b"f Q")
+    else:
+        image = generate_background(bg_style, size, bg_color, bg_color2,
+                                    angle=bg_angle, intensity=bg_intensity)
+        data = zlib.compress(image.tobytes())
+        xobject = add(f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                      f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+                      f"/Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream")
+        resources.append(f"/XObject << /Im1 {xobject} 0 R >>")
+        # Image space is y-up, so flip it back inside the y-down page
+        content.append(f"q {width} 0 0 -{height} 0 {height} cm /Im1 Do Q".encode())
+
+    # A Type0 font with two-byte codes covers any character in the font. Each
+    # distinct character gets its own CID, mapped to its glyph in the
+    # embedded (subset) font, so missing characters still extract correctly.
+    font = load_font(font_name, font_size)
+    chars = "".join(sorted(set("".join(line for line, _, _ in lines)))) or " "
+    raw = font_data(font)
+    data, subset = font_bytes(raw, chars)
+    cids = {char: cid for cid, char in enumerate(chars, start=1)}
+    gids = glyph_ids(data, chars)
+    cid_to_gid = bytearray(2 * (len(chars) + 1))
+    for char, cid in cids.items():
+        struct.pack_into(">H", cid_to_gid, 2 * cid, gids[char])
+
+    metrics_font = ImageFont.truetype(io.BytesIO(raw), 1000)
+    ascent, descent = metrics_font.getmetrics()
+    advance = {char: metrics_font.getlength(char) for char in chars}
+    widths = " ".join(_num(advance[char]) for char in chars)
+    base_name = "".join(ch for ch in metrics_font.getname()[0] if ch.isalnum()) or "DesignFont"
+    if subset:
+        base_name = "DSGNAA+" + base_name
+
+    font_stream = add(f"<< /Length {len(data)} /Length1 {len(data)} >>\nstream\n".encode() + data + b"\nendstream")
+    descriptor = add(f"<< /Type /FontDescriptor /FontName /{base_name} /Flags 32 "
+                     f"/FontBBox [0 {-descent} 1000 {ascent}] /ItalicAngle 0 /Ascent {ascent} "
+                     f"/Descent {-descent} /CapHeight {ascent} /StemV 80 "
+                     f"/FontFile2 {font_stream} 0 R >>".encode())
+    gid_map = add(f"<< /Length {len(cid_to_gid)} >>\nstream\n".encode() + bytes(cid_to_gid) + b"\nendstream")
+    cid_font = add(f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base_name} "
+                   f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                   f"/FontDescriptor {descriptor} 0 R /W [1 [{widths}]] "
+                   f"/CIDToGIDMap {gid_map} 0 R >>".encode())
+    cmap = _to_unicode_cmap(cids)
+    to_unicode = add(f"<< /Length {len(cmap)} >>\nstream\n".encode() + cmap + b"\nendstream")
+    font_obj = add(f"<< /Type /Font /Subtype /Type0 /BaseFont /{base_name} /Encoding /Identity-H "
+                   f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>".encode())
+    resources.append(f"/Font << /F1 {font_obj} 0 R >>")
+
+    # Size the text like the font that produced the glyph positions
+    content.append(f"BT /F1 {font.size} Tf {_pdf_rgb(text_color)} rg".encode())
+    for line, xs, baseline in lines:
+        # Kerning and rounding differences become TJ adjustments
+        items = [f"<{cids[line[0]]:04X}>".encode()]
+        for i in range(1, len(line)):
+            expected = xs[i] - xs[i - 1]
+            natural = advance[line[i - 1]] * font.size / 1000
+            shift = (natural - expected) * 1000 / font.size
+            if abs(shift) > 0.01:
+                items.append(_num(shift).encode())
+            items.append(f"<{cids[line[i]]:04X}>".encode())
+        content.append(f"1 0 0 -1 {_num(xs[0])} {_num(baseline)} Tm [".encode() + b" ".join(items) + b"] TJ")
+    content.append(b"ET")
+
+    stream = zlib.compress(b"\n".join(content))
+    contents = add(f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream")
+    pages_id = len(objects) + 2
+    page = add(f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {width} {height}] "
+               f"/Resources << {' '.join(resources)} >> /Contents {contents} 0 R >>".encode())
+    add(f"<< /Type /Pages /Kids [{page} 0 R] /Count 1 >>".encode())
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + obj + b"\nendobj\n")
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return output.getvalue()
+
+if __name__ == "__main__":
+    sample = "AVATAR Tower\nWave, yo!"
+    png = io.BytesIO()
+    render_design(sample, "Arial", 72, "#FFD700", "#2C3E50").save(png, format='PNG')
+    svg = design_to_svg(sample, "Arial", 72, "#FFD700", "#2C3E50")
+    pdf = design_to_pdf(sample, "Arial", 72, "#FFD700", "#2C3E50")
+    print(f"PNG {len(png.getvalue())} bytes, SVG {len(svg.encode())} bytes, PDF {len(pdf)} bytes")